@@ -1,32 +1,93 @@
 from __future__ import annotations
 
 import argparse
+import atexit
+import contextlib
+import functools
+import importlib
+import io
 import json
 import logging
+import math
+import mmap
+import os
+import queue
 import signal
 import subprocess
 import sys
+import threading
 import time
+from collections import ChainMap, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta, timezone
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from typing import Any
 
-from scripts.world_engine import WorldEngine, SimulationError, DataLoadError, ConfigValidationError
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used otherwise
+    orjson = None
 
 
-BASE_DIR = Path(__file__).resolve().parent
+# abspath normalizes lexically, without the realpath syscalls of Path.resolve()
+BASE_DIR = Path(os.path.abspath(__file__)).parent
 DATA_DIR = BASE_DIR / "data"
 SCRIPTS_DIR = BASE_DIR / "scripts"
 DEFAULT_CONFIG_PATH = BASE_DIR / "config.json"
 LOG_FILE = BASE_DIR / "simulation.log"
+PRODUCTION_SCHEDULE_PATH = DATA_DIR / "production_schedule.json"
+HISTORY_EVENTS_PATH = DATA_DIR / "events" / "history.jsonl"
+
+# Config files at least this large are parsed from a read-only mmap (orjson only)
+CONFIG_MMAP_THRESHOLD_BYTES = 1 << 20
+
+# Minimum wall-clock seconds between progress lines in run_simulation
+PROGRESS_MIN_INTERVAL_SECONDS = 1.0
+
+# Service state persistence cadence (whichever limit is reached first)
+STATE_SAVE_EVERY_TICKS = 24
+STATE_SAVE_INTERVAL_SECONDS = 60.0
+
+# Hours in an average (365.25-day) year; integer, so tick counts avoid float rounding
+HOURS_PER_YEAR = 8766
+
+# Ticks run per engine.tick_many call in generate-history (one simulated week)
+HISTORY_TICK_CHUNK = 168
 
 # Global logger
 logger: logging.Logger | None = None
 
+class PinnableQueueListener(QueueListener):
+    """QueueListener whose thread can be pinned to CPUs from inside itself."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._pin_request: tuple[list[int] | None, str] | None = None
+
+    def request_pin(self, cpus: list[int] | None, name: str) -> None:
+        """Pin the listener thread to cpus when it handles its next record."""
+        self._pin_request = (cpus, name)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # prepare() runs on the listener thread, so pin_thread can target it with pid 0
+        request, self._pin_request = self._pin_request, None
+        if request is not None:
+            pin_thread(*request)
+        return super().prepare(record)
+
+
+# Background listener that drains queued log records to the real handlers
+_log_listener: PinnableQueueListener | None = None
+
 
 def setup_logging(log_file: Path = LOG_FILE, level: int = logging.INFO) -> logging.Logger:
-    """Set up rotating file-based logging for background service operation."""
+    """Set up rotating file-based logging for background service operation.
+    
+    Records are put on an in-memory queue and written by a QueueListener
+    thread, so the simulation loop never blocks on file or console I/O.
+    """
+    global _log_listener
     log = logging.getLogger("simulation")
     log.setLevel(level)
     
@@ -55,15 +116,33 @@ def setup_logging(log_file: Path = LOG_FILE, level: int = logging.INFO) -> loggi
     file_handler.setFormatter(formatter)
     console_handler.setFormatter(formatter)
     
-    log.addHandler(file_handler)
-    log.addHandler(console_handler)
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    _log_listener = PinnableQueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(stop_logging)
+    
+    log.addHandler(QueueHandler(log_queue))
     
     return log
 
 
+def stop_logging() -> None:
+    """Flush queued log records and stop the background listener."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+# datetime.fromisoformat accepts a trailing "Z" natively from Python 3.11
+_FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
+
+
 def parse_start_time(value: str) -> datetime:
     """Parse ISO 8601 datetime string with optional trailing 'Z'."""
-    cleaned = value.strip().replace("Z", "+00:00")
+    cleaned = value.strip()
+    if not _FROMISOFORMAT_ACCEPTS_Z and cleaned.endswith("Z"):
+        cleaned = cleaned[:-1] + "+00:00"
     try:
         dt = datetime.fromisoformat(cleaned)
     except ValueError as e:
@@ -73,11 +152,28 @@ def parse_start_time(value: str) -> datetime:
     return dt
 
 
+def fmt_date(dt: datetime) -> str:
+    """Format as YYYY-MM-DD (same as strftime("%Y-%m-%d"), without the format parse)."""
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+
+
+def fmt_datetime_minutes(dt: datetime) -> str:
+    """Format as YYYY-MM-DD HH:MM (same as strftime("%Y-%m-%d %H:%M"))."""
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} {dt.hour:02d}:{dt.minute:02d}"
+
+
 def load_config(path: Path | None) -> dict[str, Any]:
     """Load configuration from JSON file."""
     if path is None or not path.exists():
         return {}
     try:
+        if orjson is not None:
+            if path.stat().st_size >= CONFIG_MMAP_THRESHOLD_BYTES:
+                # Parse straight from the page cache instead of copying into a bytes object
+                with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with memoryview(mm) as view:
+                        return orjson.loads(view)
+            return orjson.loads(path.read_bytes())
         return json.loads(path.read_text(encoding="utf-8"))
     except json.JSONDecodeError as e:
         print(f"Error: Invalid JSON in config file {path}: {e}", file=sys.stderr)
@@ -87,57 +183,181 @@ def load_config(path: Path | None) -> dict[str, Any]:
         sys.exit(1)
 
 
-def resolve_value(cli_value: Any, cfg_section: dict[str, Any], key: str, fallback: Any) -> Any:
-    """Resolve configuration value with priority: CLI > config file > fallback."""
-    if cli_value is not None:
-        return cli_value
-    if key in cfg_section:
-        return cfg_section[key]
-    return fallback
+# Fallback values per command, used when neither the CLI nor config.json sets a key
+COMMAND_DEFAULTS: dict[str, dict[str, Any]] = {
+    "generate": {"seed": 42},
+    "simulate": {"ticks": 24, "seed": 42, "start_time": None, "engine": {}},
+    "all": {"ticks": 24, "seed": 42, "start_time": None, "engine": {}},
+    "generate-history": {"seed": 42, "start_time": None, "engine": {}},
+    "run-service": {
+        "tick_interval": 5.0,
+        "seed": 42,
+        "engine": {},
+        "api_host": "127.0.0.1",
+        "api_port": 8010,
+        "api_enabled": True,
+        "sim_cpu_affinity": None,
+        "api_cpu_affinity": None,
+    },
+}
+
+
+def resolve_settings(args: argparse.Namespace, defaults: dict[str, Any]) -> ChainMap[str, Any]:
+    """Layer configuration values with priority: CLI > config file > fallback.
+    
+    CLI options left unset (None) fall through to the command's config
+    section. The config file is only read when the CLI leaves a setting open.
+    """
+    cli_values = {key: value for key, value in vars(args).items() if value is not None}
+    if all(key in cli_values for key in defaults):
+        return ChainMap(cli_values, defaults)
+
+    config_path = args.config or (DEFAULT_CONFIG_PATH if DEFAULT_CONFIG_PATH.exists() else None)
+    cfg_section = load_config(config_path).get(args.command, {})
+    return ChainMap(cli_values, cfg_section, defaults)
 
 
-def run_script(script_name: str, args: list[str]) -> None:
-    """Run a generator script as a subprocess."""
-    script_path = SCRIPTS_DIR / script_name
+def run_script(script_name: str, args: list[str]) -> subprocess.Popen:
+    """Start a generator script as a subprocess and return its handle."""
+    script_path = GENERATOR_SCRIPT_PATHS.get(script_name) or SCRIPTS_DIR / script_name
     if not script_path.exists():
         print(f"Error: Script not found: {script_path}", file=sys.stderr)
         sys.exit(1)
     
     cmd = [sys.executable, str(script_path), *args]
     try:
-        subprocess.run(cmd, check=True)
-    except subprocess.CalledProcessError as e:
-        print(f"Error: Script {script_name} failed with exit code {e.returncode}", file=sys.stderr)
-        sys.exit(1)
-    except FileNotFoundError as e:
+        # close_fds=False lets Popen launch via os.posix_spawn where supported;
+        # Python-created descriptors are non-inheritable, so nothing extra leaks.
+        # Generators never read stdin, so parallel children don't share the terminal's
+        return subprocess.Popen(cmd, stdin=subprocess.DEVNULL, close_fds=False)
+    except OSError as e:
         print(f"Error: Cannot execute {cmd[0]}: {e}", file=sys.stderr)
         sys.exit(1)
 
 
-def generate_all(seed: int | None = None) -> None:
-    """Generate all data files using generator scripts."""
-    seed_args = ["--seed", str(seed)] if seed is not None else []
+def run_generator(script_name: str, args: list[str]) -> int:
+    """Run a generator script's main() in this process and return its exit code."""
+    try:
+        module = importlib.import_module(f"scripts.{Path(script_name).stem}")
+        return module.main(args)
+    except SystemExit as e:
+        # Same mapping as the interpreter: None is success, other non-ints are printed
+        if e.code is None:
+            return 0
+        if isinstance(e.code, int):
+            return e.code
+        print(f"Error: {script_name}: {e.code}", file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(f"Error: {script_name}: {e}", file=sys.stderr)
+        return 1
 
-    print("Generating suppliers...")
-    run_script("generate_suppliers.py", seed_args)
-    print("Generating parts...")
-    run_script("generate_parts.py", seed_args)
-    print("Generating products...")
-    run_script("generate_products.py", seed_args)
-    print("Generating BOM...")
-    run_script("generate_bom.py", [])
-    print("Generating facilities...")
-    run_script("generate_facilities.py", [])
-    print("Generating routes...")
-    run_script("generate_routes.py", [])
-    print("Generating customers...")
-    run_script("generate_customers.py", seed_args)
-    print("Generating inventory...")
-    run_script("generate_inventory.py", seed_args)
-    # production_schedule.json is optional; write minimal file so it exists after generate
-    (DATA_DIR / "production_schedule.json").write_text(
-        '{"active_jobs": []}\n', encoding="utf-8"
-    )
+
+class StageOutput:
+    """sys.stdout stand-in that sends a capturing thread's writes to its own buffer.
+
+    Generators run concurrently on worker threads; capturing each stage's
+    output and printing it from the main thread keeps lines from interleaving.
+    """
+
+    def __init__(self, stream: Any) -> None:
+        self._stream = stream
+        self._local = threading.local()
+
+    def capture(self, func: Any, *args: Any) -> tuple[Any, str]:
+        """Call func(*args) with this thread's output buffered; return (result, output)."""
+        self._local.buffer = io.StringIO()
+        try:
+            return func(*args), self._local.buffer.getvalue()
+        finally:
+            del self._local.buffer
+
+    def write(self, text: str) -> int:
+        return getattr(self._local, "buffer", self._stream).write(text)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
+
+# Contents written to production_schedule.json by generate_all
+EMPTY_PRODUCTION_SCHEDULE = b'{"active_jobs": []}\n'
+
+
+# Generator stages: name -> (label, script, accepts --seed)
+GENERATOR_STAGES: dict[str, tuple[str, str, bool]] = {
+    "suppliers": ("suppliers", "generate_suppliers.py", True),
+    "parts": ("parts", "generate_parts.py", True),
+    "products": ("products", "generate_products.py", True),
+    "bom": ("BOM", "generate_bom.py", False),
+    "facilities": ("facilities", "generate_facilities.py", False),
+    "routes": ("routes", "generate_routes.py", False),
+    "customers": ("customers", "generate_customers.py", True),
+    "inventory": ("inventory", "generate_inventory.py", True),
+}
+
+GENERATOR_SCRIPT_PATHS: dict[str, Path] = {
+    script: SCRIPTS_DIR / script for _, script, _ in GENERATOR_STAGES.values()
+}
+
+# Stages that read files written by other stages (bom.json validates against
+# parts.json; inventory.json is built from parts.json and products.json).
+GENERATOR_DEPENDENCIES: dict[str, set[str]] = {
+    "bom": {"parts"},
+    "inventory": {"parts", "products"},
+}
+
+
+def generate_all(seed: int | None = None, isolate: bool = False, compact: bool = False) -> None:
+    """Generate all data files, running independent generators concurrently.
+    
+    Generators run in-process by default; with isolate=True each one runs as
+    a separate subprocess instead. compact=True writes unindented JSON.
+    """
+    seed_args = ["--seed", str(seed)] if seed is not None else []
+    common_args = ["--compact"] if compact else []
+
+    pending = dict(GENERATOR_STAGES)
+    done: set[str] = set()
+    running: dict[Future, tuple[str, str, subprocess.Popen | None]] = {}
+
+    stage_output = StageOutput(sys.stdout)
+    with contextlib.redirect_stdout(stage_output), ThreadPoolExecutor(max_workers=len(GENERATOR_STAGES)) as pool:
+
+        def start_ready_stages() -> None:
+            for name in list(pending):
+                if GENERATOR_DEPENDENCIES.get(name, set()) <= done:
+                    label, script, accepts_seed = pending.pop(name)
+                    args = (seed_args if accepts_seed else []) + common_args
+                    print(f"Generating {label}...")
+                    if isolate:
+                        proc = run_script(script, args)
+                        running[pool.submit(lambda proc=proc: (proc.wait(), ""))] = (name, script, proc)
+                    else:
+                        running[pool.submit(stage_output.capture, run_generator, script, args)] = (name, script, None)
+
+        start_ready_stages()
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name, script, _proc = running.pop(future)
+                returncode, output = future.result()
+                sys.stdout.write(output)
+                if returncode != 0:
+                    for _, _, other in running.values():
+                        if other is not None:
+                            other.terminate()
+                    print(f"Error: Script {script} failed with exit code {returncode}", file=sys.stderr)
+                    sys.exit(1)
+                done.add(name)
+            start_ready_stages()
+
+    # production_schedule.json is optional; reset it to an empty schedule so it
+    # matches the fresh inventory, skipping the write if it is already empty
+    if (
+        not PRODUCTION_SCHEDULE_PATH.exists()
+        or PRODUCTION_SCHEDULE_PATH.read_bytes() != EMPTY_PRODUCTION_SCHEDULE
+    ):
+        PRODUCTION_SCHEDULE_PATH.write_bytes(EMPTY_PRODUCTION_SCHEDULE)
     print("Data generation complete.")
 
 
@@ -158,6 +378,8 @@ def run_simulation(
     engine_config: dict[str, Any] | None = None,
 ) -> None:
     """Run the supply chain simulation."""
+    from scripts.world_engine import WorldEngine, DataLoadError, ConfigValidationError
+
     validate_simulation_params(ticks, seed)
     
     try:
@@ -176,11 +398,20 @@ def run_simulation(
         sys.exit(1)
     
     print(f"Running simulation for {ticks} ticks...")
-    for i in range(ticks):
-        engine.tick()
-        # Progress indicator every 24 ticks (1 simulated day)
-        if (i + 1) % 24 == 0:
-            print(f"  Completed {i + 1} ticks ({(i + 1) // 24} days)")
+    last_report = time.monotonic()
+    completed = 0
+    # Run one simulated day (24 ticks) per chunk; intermediate progress is
+    # reported at most once per interval, the final count always
+    while completed < ticks:
+        chunk = min(24, ticks - completed)
+        engine.tick_many(chunk)
+        completed += chunk
+        if completed < ticks:
+            now = time.monotonic()
+            if now - last_report >= PROGRESS_MIN_INTERVAL_SECONDS:
+                print(f"  Completed {completed} ticks ({completed // 24} days)")
+                last_report = now
+    print(f"  Completed {completed} ticks ({completed // 24} days)")
     
     engine.save_state()
     print(f"Simulation complete. Events logged to: date-partitioned files in {engine.events_dir}")
@@ -198,15 +429,17 @@ def run_history_generation(
     up historical data that can later be manually transferred to PostgreSQL.
     Events are written to a single file for speed (no per-day rollover).
     """
+    from scripts.world_engine import WorldEngine, DataLoadError, ConfigValidationError
+
     if years < 1 or years > 3:
         print(f"Error: years must be between 1 and 3, got {years}", file=sys.stderr)
         sys.exit(1)
     
     # Calculate total ticks (hours in N years)
-    # Using 365.25 days/year to account for leap years
-    ticks = int(years * 365.25 * 24)
+    # Using 365.25 days/year to account for leap years (365.25 * 24 == 8766 exactly)
+    ticks = years * HOURS_PER_YEAR
     include_black_swan = (years == 3)
-    history_output_path = DATA_DIR / "events" / "history.jsonl"
+    history_output_path = HISTORY_EVENTS_PATH
     
     print(f"Generating {years} year(s) of historical data...")
     print(f"  Total ticks: {ticks:,} ({ticks // 24:,} days)")
@@ -234,25 +467,29 @@ def run_history_generation(
         print(f"Configuration error: {e}", file=sys.stderr)
         sys.exit(1)
     
-    # Track progress
+    # Track progress: tick counts at which each 5% step is reached
     start_real_time = time.time()
-    last_progress = 0
+    progress_steps = deque((math.ceil(ticks * pct / 100), pct) for pct in range(5, 101, 5))
     
     print("\nRunning accelerated simulation...")
-    for i in range(ticks):
-        engine.tick()
+    # Run in chunks of one simulated week (168 ticks); progress is checked per chunk
+    completed = 0
+    while completed < ticks:
+        chunk = min(HISTORY_TICK_CHUNK, ticks - completed)
+        engine.tick_many(chunk)
+        completed += chunk
         
-        # Progress indicator every simulated week (168 ticks)
-        progress_pct = int((i + 1) / ticks * 100)
-        if progress_pct >= last_progress + 5:  # Every 5%
+        if progress_steps and completed >= progress_steps[0][0]:
+            while progress_steps and completed >= progress_steps[0][0]:
+                _, progress_pct = progress_steps.popleft()
+            engine.flush_events(fsync=True)
             elapsed = time.time() - start_real_time
-            rate = (i + 1) / elapsed if elapsed > 0 else 0
-            eta_seconds = (ticks - i - 1) / rate if rate > 0 else 0
+            rate = completed / elapsed if elapsed > 0 else 0
+            eta_seconds = (ticks - completed) / rate if rate > 0 else 0
             
-            sim_date = engine.current_time.strftime("%Y-%m-%d")
+            sim_date = fmt_date(engine.current_time)
             print(f"  {progress_pct:3d}% | Sim date: {sim_date} | "
                   f"Rate: {rate:.0f} ticks/sec | ETA: {eta_seconds / 60:.1f} min")
-            last_progress = progress_pct
     
     engine.save_state()
     
@@ -267,6 +504,30 @@ def run_history_generation(
     print("  3. Run 'python main.py run-service' to start 24/7 simulation")
 
 
+def is_cpu_list(value: Any) -> bool:
+    """Return True if value is a list of CPU ids (ints), as sched_setaffinity expects."""
+    return isinstance(value, list) and all(isinstance(cpu, int) and not isinstance(cpu, bool) for cpu in value)
+
+
+def pin_thread(cpus: list[int] | None, name: str, thread_id: int = 0) -> None:
+    """Restrict a thread (the calling thread by default) to the given CPUs.
+
+    thread_id is an OS thread id such as Thread.native_id. Linux only; no-op
+    if cpus is empty.
+    """
+    if not cpus:
+        return
+    if not hasattr(os, "sched_setaffinity"):
+        logger.warning(f"{name} CPU affinity requested but not supported on this platform")
+        return
+    try:
+        # On Linux the pid argument is a thread id; 0 means the calling thread
+        os.sched_setaffinity(thread_id, set(cpus))
+        logger.info(f"  {name} thread pinned to CPUs {sorted(set(cpus))}")
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not set {name} CPU affinity {cpus}: {e}")
+
+
 def run_continuous_service(
     tick_interval: float,
     resume: bool,
@@ -275,13 +536,18 @@ def run_continuous_service(
     api_host: str = "127.0.0.1",
     api_port: int = 8010,
     api_enabled: bool = True,
+    sim_cpu_affinity: list[int] | None = None,
+    api_cpu_affinity: list[int] | None = None,
 ) -> None:
     """Run simulation as a continuous 24/7 service.
     
     Events are written to date-partitioned JSONL (data/events/). State is
-    persisted to PostgreSQL after each tick for resume capability.
+    persisted to PostgreSQL periodically (see STATE_SAVE_EVERY_TICKS and
+    STATE_SAVE_INTERVAL_SECONDS) and on shutdown for resume capability.
     """
     global logger
+    from scripts.world_engine import WorldEngine, DataLoadError, ConfigValidationError
+
     logger = setup_logging()
     
     logger.info("=" * 60)
@@ -336,91 +602,130 @@ def run_continuous_service(
         logger.error(f"Configuration error: {e}")
         sys.exit(1)
     
-    # Set up graceful shutdown
+    # Set up graceful shutdown: the handler only sets a flag; the main loop
+    # notices it between ticks (or immediately, while waiting for the next tick)
+    shutdown_event = threading.Event()
+
     def handle_shutdown(signum, frame):
-        logger.info(f"Received signal {signum}. Initiating graceful shutdown...")
-        engine.shutdown()
+        shutdown_event.set()
     
     signal.signal(signal.SIGTERM, handle_shutdown)
     signal.signal(signal.SIGINT, handle_shutdown)
     
     # Start live API in daemon thread (read-only; call and get values)
+    api_server = None
     if api_enabled:
         try:
-            import threading
             from scripts.api import create_app
             import uvicorn
             app = create_app(engine)
-            thread = threading.Thread(
-                target=uvicorn.run,
-                kwargs={"app": app, "host": api_host, "port": api_port},
-                daemon=True,
+            # loop/http stay "auto": uvloop and httptools are used when installed
+            api_server = uvicorn.Server(
+                uvicorn.Config(
+                    app,
+                    host=api_host,
+                    port=api_port,
+                    lifespan="off",
+                    access_log=False,
+                )
             )
+
+            def serve_api() -> None:
+                pin_thread(api_cpu_affinity, "API")
+                api_server.run()
+
+            thread = threading.Thread(target=serve_api, daemon=True)
             thread.start()
             logger.info(f"  API: http://{api_host}:{api_port} (GET /status, /inventory, /backorders, /deliveries)")
         except Exception as e:
             logger.warning(f"Could not start API server: {e}")
     
-    logger.info(f"Service configuration:")
-    logger.info(f"  Tick interval: {tick_interval} seconds")
-    logger.info(f"  Events: JSONL (date-partitioned in data/events/)")
-    logger.info(f"  Starting simulation time: {engine.current_time}")
-    logger.info("")
-    logger.info("Service is running. Press Ctrl+C to stop.")
-    
-    # Import db_manager for state persistence (optional)
+    # Import db_manager for state persistence (optional); running-state saves
+    # go through a background writer so ticks never wait on the database
     db_manager = None
+    state_writer = None
     try:
         from scripts import db_manager as dbm
         db_manager = dbm
+        state_writer = dbm.StateWriter()
     except ImportError:
         logger.warning("Database module not available. State will not be persisted.")
     
+    # Helper threads (state writer, log listener) share the API CPU set, and
+    # the simulation (main) thread is pinned last, so no other thread
+    # inherits its CPU set
+    if state_writer is not None:
+        pin_thread(api_cpu_affinity, "State writer", state_writer.native_id)
+    if _log_listener is not None:
+        _log_listener.request_pin(api_cpu_affinity, "Log listener")
+    pin_thread(sim_cpu_affinity, "Simulation")
+    
+    logger.info(f"Service configuration:")
+    logger.info(f"  Tick interval: {tick_interval} seconds")
+    logger.info(f"  Events: JSONL (date-partitioned in data/events/)")
+    logger.info(f"  Starting simulation time: {engine.current_time}")
+    logger.info("")
+    logger.info("Service is running. Press Ctrl+C to stop.")
+    
     # Main service loop
     ticks_since_log = 0
-    while engine.running:
+    ticks_since_save = 0
+    last_saved_at = time.monotonic()
+    # Ticks are scheduled on a fixed monotonic-clock grid, so the cadence does
+    # not drift with tick duration or wall-clock (NTP) adjustments
+    next_tick_at = time.monotonic()
+    while not shutdown_event.is_set():
         try:
-            tick_start = time.time()
+            next_tick_at += tick_interval
             
             # Run one simulation tick
             engine.tick()
             ticks_since_log += 1
+            ticks_since_save += 1
             
-            # Save state to database
-            if db_manager:
-                try:
-                    db_manager.save_system_state(
-                        engine.current_time,
-                        engine.tick_count,
-                        status="running"
-                    )
-                except Exception as e:
-                    logger.warning(f"Failed to save state: {e}")
+            # Save state to database every STATE_SAVE_EVERY_TICKS ticks or
+            # STATE_SAVE_INTERVAL_SECONDS, whichever comes first (final state
+            # is always saved on shutdown below)
+            if state_writer and (
+                ticks_since_save >= STATE_SAVE_EVERY_TICKS
+                or time.monotonic() - last_saved_at >= STATE_SAVE_INTERVAL_SECONDS
+            ):
+                ticks_since_save = 0
+                last_saved_at = time.monotonic()
+                state_writer.submit(engine.current_time, engine.tick_count, status="running")
             
             # Log progress every 24 ticks (1 simulated day)
             if ticks_since_log >= 24:
                 logger.info(
                     f"Tick {engine.tick_count:,} | "
-                    f"Sim time: {engine.current_time.strftime('%Y-%m-%d %H:%M')} | "
+                    f"Sim time: {fmt_datetime_minutes(engine.current_time)} | "
                     f"Day {engine.tick_count // 24:,}"
                 )
                 ticks_since_log = 0
             
-            # Sleep for the configured interval
-            tick_duration = time.time() - tick_start
-            sleep_time = max(0, tick_interval - tick_duration)
-            if sleep_time > 0:
-                time.sleep(sleep_time)
+            # Wait for the next scheduled tick; if this tick overran its slot,
+            # skip the missed slots instead of running ticks back to back
+            now = time.monotonic()
+            if now > next_tick_at and tick_interval > 0:
+                next_tick_at += math.ceil((now - next_tick_at) / tick_interval) * tick_interval
+            if next_tick_at > now:
+                shutdown_event.wait(next_tick_at - now)
                 
         except Exception as e:
             logger.error(f"Error during tick {engine.tick_count}: {e}", exc_info=True)
             # Continue running despite errors
-            time.sleep(tick_interval)
+            shutdown_event.wait(tick_interval)
+            next_tick_at = time.monotonic()
     
     # Graceful shutdown
-    logger.info("Shutting down...")
-    
-    # Save final state
+    logger.info("Received shutdown signal. Shutting down...")
+    engine.shutdown()
+    if api_server is not None:
+        api_server.should_exit = True
+    
+    # Save final state (after the writer has flushed any pending running state)
+    if state_writer:
+        state_writer.close()
     if db_manager:
         try:
             db_manager.save_system_state(
@@ -441,9 +746,12 @@ def run_continuous_service(
     
     logger.info(f"Service stopped. Final tick count: {engine.tick_count:,}")
     logger.info(f"Final simulation time: {engine.current_time}")
+    stop_logging()
 
 
-def main() -> int:
+@functools.lru_cache(maxsize=1)
+def build_parser() -> argparse.ArgumentParser:
+    """Build the CLI parser (built once per process and reused)."""
     parser = argparse.ArgumentParser(
         description="Supply chain simulator CLI",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -473,6 +781,16 @@ Examples:
     # generate command
     gen = sub.add_parser("generate", help="Generate all data files")
     gen.add_argument("--seed", type=int, default=None, help="Seed for generators.")
+    gen.add_argument(
+        "--isolate",
+        action="store_true",
+        help="Run each generator script in its own subprocess.",
+    )
+    gen.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write data files as compact JSON instead of pretty-printed.",
+    )
 
     # simulate command
     sim = sub.add_parser("simulate", help="Run the simulator for fixed ticks")
@@ -489,6 +807,16 @@ Examples:
     both = sub.add_parser("all", help="Generate all data then run the simulator")
     both.add_argument("--ticks", type=int, default=None, help="Number of hourly ticks to run.")
     both.add_argument("--seed", type=int, default=None, help="Seed for generators and simulator.")
+    both.add_argument(
+        "--isolate",
+        action="store_true",
+        help="Run each generator script in its own subprocess.",
+    )
+    both.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write data files as compact JSON instead of pretty-printed.",
+    )
     both.add_argument(
         "--start-time",
         type=str,
@@ -524,8 +852,8 @@ Examples:
     svc.add_argument(
         "--tick-interval",
         type=float,
-        default=5.0,
-        help="Seconds between simulation ticks (default: 5.0).",
+        default=None,
+        help="Seconds between simulation ticks (default: config tick_interval, else 5.0).",
     )
     svc.add_argument(
         "--resume",
@@ -540,51 +868,37 @@ Examples:
     )
     svc.add_argument("--seed", type=int, default=None, help="Simulation RNG seed.")
 
-    args = parser.parse_args()
-    config_path = args.config or (DEFAULT_CONFIG_PATH if DEFAULT_CONFIG_PATH.exists() else None)
-    config = load_config(config_path)
+    return parser
 
-    if args.command == "generate":
-        section = config.get("generate", {})
-        seed = resolve_value(args.seed, section, "seed", 42)
-        generate_all(seed=seed)
-        return 0
 
-    if args.command == "simulate":
-        section = config.get("simulate", {})
-        ticks = resolve_value(args.ticks, section, "ticks", 24)
-        seed = resolve_value(args.seed, section, "seed", 42)
-        start_raw = resolve_value(args.start_time, section, "start_time", None)
-        engine_config = section.get("engine", {})
-        try:
-            start_time = parse_start_time(start_raw) if start_raw else None
-        except ValueError as e:
-            print(f"Error: {e}", file=sys.stderr)
-            return 1
-        run_simulation(ticks=ticks, seed=seed, start_time=start_time, engine_config=engine_config)
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    settings = resolve_settings(args, COMMAND_DEFAULTS.get(args.command, {}))
+
+    if args.command == "generate":
+        generate_all(seed=settings["seed"], isolate=args.isolate, compact=args.compact)
         return 0
 
-    if args.command == "all":
-        section = config.get("all", {})
-        ticks = resolve_value(args.ticks, section, "ticks", 24)
-        seed = resolve_value(args.seed, section, "seed", 42)
-        start_raw = resolve_value(args.start_time, section, "start_time", None)
-        engine_config = section.get("engine", {})
+    if args.command in ("simulate", "all"):
+        start_raw = settings["start_time"]
         try:
             start_time = parse_start_time(start_raw) if start_raw else None
         except ValueError as e:
             print(f"Error: {e}", file=sys.stderr)
             return 1
-        generate_all(seed=seed)
-        run_simulation(ticks=ticks, seed=seed, start_time=start_time, engine_config=engine_config)
+        if args.command == "all":
+            generate_all(seed=settings["seed"], isolate=args.isolate, compact=args.compact)
+        run_simulation(
+            ticks=settings["ticks"],
+            seed=settings["seed"],
+            start_time=start_time,
+            engine_config=settings["engine"],
+        )
         return 0
 
     if args.command == "generate-history":
-        section = config.get("generate-history", {})
         years = args.years  # Required, no fallback
-        seed = resolve_value(args.seed, section, "seed", 42)
-        start_raw = resolve_value(args.start_time, section, "start_time", None)
-        engine_config = section.get("engine", {})
+        start_raw = settings["start_time"]
 
         # Default start time: N years before now
         if start_raw:
@@ -598,30 +912,29 @@ Examples:
         
         run_history_generation(
             years=years,
-            seed=seed,
+            seed=settings["seed"],
             start_time=start_time,
-            engine_config=engine_config
+            engine_config=settings["engine"],
         )
         return 0
 
     if args.command == "run-service":
-        section = config.get("run-service", {})
-        tick_interval = resolve_value(args.tick_interval, section, "tick_interval", 5.0)
-        seed = resolve_value(args.seed, section, "seed", 42)
-        engine_config = section.get("engine", {})
-        api_host = section.get("api_host", "127.0.0.1")
-        api_port = section.get("api_port", 8010)
-        api_enabled = section.get("api_enabled", True)
+        for key in ("sim_cpu_affinity", "api_cpu_affinity"):
+            if settings[key] is not None and not is_cpu_list(settings[key]):
+                print(f"Error: {key} must be a list of CPU ids, got {settings[key]!r}", file=sys.stderr)
+                return 1
         # --fresh overrides --resume
         resume = not args.fresh
         run_continuous_service(
-            tick_interval=tick_interval,
+            tick_interval=settings["tick_interval"],
             resume=resume,
-            seed=seed,
-            engine_config=engine_config,
-            api_host=api_host,
-            api_port=api_port,
-            api_enabled=api_enabled,
+            seed=settings["seed"],
+            engine_config=settings["engine"],
+            api_host=settings["api_host"],
+            api_port=settings["api_port"],
+            api_enabled=settings["api_enabled"],
+            sim_cpu_affinity=settings["sim_cpu_affinity"],
+            api_cpu_affinity=settings["api_cpu_affinity"],
         )
         return 0
 
@@ -1,11 +1,26 @@
 """Minimal live API: read-only GET endpoints for status, inventory, backorders, deliveries. Call and get values."""
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Any
 
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class _ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (FastAPI's own ORJSONResponse is deprecated)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+DefaultResponse = _ORJSONResponse if orjson is not None else JSONResponse
 
 # Engine reference set by main when starting run-service
 _engine: Any = None
@@ -22,7 +37,11 @@ def get_engine() -> Any:
     return _engine
 
 
-app = FastAPI(title="Supply Chain Simulator API", description="Read-only live state. Call and get values.")
+app = FastAPI(
+    title="Supply Chain Simulator API",
+    description="Read-only live state. Call and get values.",
+    default_response_class=DefaultResponse,
+)
 
 
 def create_app(engine: Any | None = None) -> FastAPI:
@@ -31,10 +50,18 @@ def create_app(engine: Any | None = None) -> FastAPI:
     return app
 
 
+# orjson datetime output matching _iso_utc: naive treated as UTC, "Z" suffix, whole seconds
+_ORJSON_DATETIME_OPTIONS = (
+    (orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_OMIT_MICROSECONDS) if orjson is not None else 0
+)
+
+
 def _iso_utc(dt: datetime) -> str:
+    # Format first and fix up the suffix; naive datetimes are taken as UTC
+    s = dt.isoformat(timespec="seconds")
     if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    return dt.isoformat(timespec="seconds").replace("+00:00", "Z")
+        return s + "Z"
+    return s[:-6] + "Z" if s.endswith("+00:00") else s
 
 
 @app.get("/status")
@@ -48,26 +75,59 @@ def get_status() -> dict:
     }
 
 
-@app.get("/inventory")
-def get_inventory() -> dict:
+# Serialized /inventory body, keyed by the (engine, inventory_version) it was built from
+_inventory_body_cache: tuple[tuple[int, int], bytes] | None = None
+
+
+@app.get("/inventory", response_model=None)
+def get_inventory() -> Any:
     """All current inventory (parts + products)."""
-    return get_engine().inventory
+    global _inventory_body_cache
+    e = get_engine()
+    version = getattr(e, "inventory_version", None)
+    if orjson is None or version is None:
+        return e.inventory
+    # Read the version before serializing: a concurrent tick can only make the
+    # body newer than its stamp, and the bumped version forces a rebuild
+    stamp = (id(e), version)
+    cached = _inventory_body_cache
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, orjson.dumps(e.inventory))
+        _inventory_body_cache = cached
+    return Response(content=cached[1], media_type="application/json")
+
+
+# Inventory keys per catalog ("parts"/"products"), cached with the (engine, inventory size)
+# they were computed for; catalogs are fixed at engine load, so keys only change with size
+_inventory_keys_cache: dict[str, tuple[tuple[int, int], list[str]]] = {}
+
+
+def _inventory_keys(e: Any, kind: str, catalog: Any) -> list[str]:
+    stamp = (id(e), len(e.inventory))
+    cached = _inventory_keys_cache.get(kind)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    keys = [k for k in catalog if k in e.inventory]
+    _inventory_keys_cache[kind] = (stamp, keys)
+    return keys
 
 
 @app.get("/inventory/parts")
 def get_inventory_parts() -> dict:
     """Only parts (keys in parts_by_id)."""
     e = get_engine()
-    parts_by_id = getattr(e, "parts_by_id", {})
-    return {k: e.inventory.get(k, {}) for k in parts_by_id if k in e.inventory}
+    inventory = e.inventory
+    keys = _inventory_keys(e, "parts", getattr(e, "parts_by_id", {}))
+    return {k: inventory.get(k, {}) for k in keys}
 
 
 @app.get("/inventory/products")
 def get_inventory_products() -> dict:
     """Only finished products (keys in product_ids)."""
     e = get_engine()
-    product_ids = getattr(e, "product_ids", [])
-    return {k: e.inventory.get(k, {}) for k in product_ids if k in e.inventory}
+    inventory = e.inventory
+    keys = _inventory_keys(e, "products", getattr(e, "product_ids", []))
+    return {k: inventory.get(k, {}) for k in keys}
 
 
 @app.get("/inventory/{item_id}")
@@ -79,12 +139,17 @@ def get_inventory_item(item_id: str) -> dict:
     return e.inventory[item_id]
 
 
-@app.get("/backorders")
-def get_backorders() -> list[dict]:
+@app.get("/backorders", response_model=None)
+def get_backorders() -> Any:
     """Pending backorders."""
     e = get_engine()
+    backorders = list(getattr(e, "_pending_backorders", []))
+    if orjson is not None:
+        # PendingBackorder's fields are exactly the response fields, so the
+        # dataclasses are serialized directly without building dicts
+        return Response(orjson.dumps(backorders, option=_ORJSON_DATETIME_OPTIONS), media_type="application/json")
     out = []
-    for bo in getattr(e, "_pending_backorders", []):
+    for bo in backorders:
         out.append({
             "order_id": bo.order_id,
             "customer_id": bo.customer_id,
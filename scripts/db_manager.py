@@ -10,6 +10,7 @@ Key Functions:
     - test_connection(): Test database connectivity
     - save_system_state(): Persist simulation state for resume capability
     - load_system_state(): Load state for resuming simulation
+    - StateWriter: Background writer that persists the latest state off the caller's thread
 
 Usage:
     from scripts.db_manager import load_system_state, save_system_state, test_connection
@@ -25,70 +26,130 @@ from __future__ import annotations
 
 import logging
 import os
+import threading
 from contextlib import contextmanager
 from datetime import datetime, timezone
 from typing import Any, Generator
 from dotenv import load_dotenv
 from sqlalchemy import create_engine, text
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 from sqlalchemy.exc import SQLAlchemyError, OperationalError
 
+try:
+    import psycopg  # psycopg 3: can prepare repeated statements server-side
+except ImportError:
+    psycopg = None
 
-# Module-level engine cache for connection reuse
+
+# Read .env once per process; reset_engine() and later get_engine() calls reuse os.environ
+load_dotenv()
+
+# Module-level engine and session factory cache for connection reuse
 _engine: Engine | None = None
+_SessionLocal: sessionmaker | None = None
 
 # Logger for database operations
 _logger = logging.getLogger("simulation.db")
 
 TABLE_SYSTEM_STATE = "system_state"
 
+# SQL statements built once at import and reused on every call
+_UPSERT_SYSTEM_STATE_SQL = text(f"""
+    INSERT INTO {TABLE_SYSTEM_STATE} (id, current_simulation_time, tick_count, status, last_updated)
+    VALUES (1, :current_time, :tick_count, :status, NOW())
+    ON CONFLICT (id) DO UPDATE SET
+        current_simulation_time = :current_time,
+        tick_count = :tick_count,
+        status = :status,
+        last_updated = NOW()
+""")
+
+# Plain strings: they take no parameters, so they are sent as-is via exec_driver_sql
+_SELECT_SYSTEM_STATE_SQL = (
+    "SELECT current_simulation_time, tick_count, status, last_updated"
+    f" FROM {TABLE_SYSTEM_STATE} WHERE id = 1 LIMIT 1"
+)
+
+_PING_SQL = "SELECT 1"
+
 
 def get_engine() -> Engine:
     """Create or return cached SQLAlchemy engine from .env credentials.
     
+    If DB_POOLER_URL is set (e.g. a pgbouncer in transaction-pool mode on
+    port 6432), connections go through it instead and SQLAlchemy does no
+    pooling of its own.
+    
     Returns:
         SQLAlchemy Engine instance connected to PostgreSQL.
         
     Raises:
         ValueError: If required environment variables are missing.
     """
-    global _engine
+    global _engine, _SessionLocal
     if _engine is not None:
         return _engine
     
-    load_dotenv()
+    pooler_url = os.getenv("DB_POOLER_URL")
+    if not pooler_url:
+        required_vars = ["DB_HOST", "DB_PORT", "DB_NAME", "DB_USER", "DB_PASSWORD"]
+        missing = [var for var in required_vars if not os.getenv(var)]
+        if missing:
+            raise ValueError(f"Missing required environment variables: {', '.join(missing)}")
     
-    required_vars = ["DB_HOST", "DB_PORT", "DB_NAME", "DB_USER", "DB_PASSWORD"]
-    missing = [var for var in required_vars if not os.getenv(var)]
-    if missing:
-        raise ValueError(f"Missing required environment variables: {', '.join(missing)}")
+    # TCP keepalives let libpq notice dead connections without a SELECT 1 per checkout
+    connect_args: dict[str, Any] = {
+        "keepalives": 1,
+        "keepalives_idle": 30,
+        "keepalives_interval": 10,
+        "keepalives_count": 5,
+    }
+    # Prefer psycopg 3 so the system_state UPSERT/SELECT are prepared after first
+    # use; fall back to psycopg2 when it is not installed
+    if psycopg is not None:
+        driver = "postgresql+psycopg"
+        connect_args["prepare_threshold"] = 1
+    else:
+        driver = "postgresql+psycopg2"
     
-    host = os.getenv("DB_HOST")
-    port = os.getenv("DB_PORT")
-    name = os.getenv("DB_NAME")
-    user = os.getenv("DB_USER")
-    password = os.getenv("DB_PASSWORD")
-    sslmode = os.getenv("DB_SSLMODE", "require")
-    
-    url = f"postgresql://{user}:{password}@{host}:{port}/{name}?sslmode={sslmode}"
-    
-    _engine = create_engine(
-        url,
-        pool_pre_ping=True,  # Verify connections before use
-        pool_size=5,
-        max_overflow=10,
-        pool_recycle=3600,  # Recycle connections after 1 hour
-    )
+    if pooler_url:
+        # Transaction pooling hands each transaction to any server connection,
+        # so prepared statements cannot be reused; the bouncer does the pooling
+        if psycopg is not None:
+            connect_args["prepare_threshold"] = None
+        _engine = create_engine(
+            make_url(pooler_url).set(drivername=driver),
+            connect_args=connect_args,
+            poolclass=NullPool,
+        )
+    else:
+        host = os.getenv("DB_HOST")
+        port = os.getenv("DB_PORT")
+        name = os.getenv("DB_NAME")
+        user = os.getenv("DB_USER")
+        password = os.getenv("DB_PASSWORD")
+        sslmode = os.getenv("DB_SSLMODE", "require")
+        url = f"{driver}://{user}:{password}@{host}:{port}/{name}?sslmode={sslmode}"
+        _engine = create_engine(
+            url,
+            connect_args=connect_args,
+            pool_size=5,
+            max_overflow=10,
+            pool_recycle=300,  # Recycle connections after 5 minutes
+        )
+    _SessionLocal = sessionmaker(bind=_engine, expire_on_commit=False)
     return _engine
 
 
 def reset_engine() -> None:
     """Reset the cached engine (useful for testing or reconnection)."""
-    global _engine
+    global _engine, _SessionLocal
     if _engine is not None:
         _engine.dispose()
         _engine = None
+    _SessionLocal = None
 
 
 @contextmanager
@@ -102,9 +163,8 @@ def get_session() -> Generator[Session, None, None]:
         with get_session() as session:
             session.execute(text("SELECT 1"))
     """
-    engine = get_engine()
-    SessionLocal = sessionmaker(bind=engine)
-    session = SessionLocal()
+    get_engine()
+    session = _SessionLocal()
     try:
         yield session
         session.commit()
@@ -122,8 +182,8 @@ def test_connection() -> bool:
         True if connection successful, False otherwise.
     """
     try:
-        with get_session() as session:
-            session.execute(text("SELECT 1"))
+        with get_engine().connect() as conn:
+            conn.exec_driver_sql(_PING_SQL)
         return True
     except Exception:
         return False
@@ -151,18 +211,10 @@ def save_system_state(
         save_system_state(datetime.now(timezone.utc), 1000, "running")
     """
     try:
-        with get_session() as session:
+        with get_engine().begin() as conn:
             # Upsert pattern: insert or update the single row
-            session.execute(
-                text(f"""
-                    INSERT INTO {TABLE_SYSTEM_STATE} (id, current_simulation_time, tick_count, status, last_updated)
-                    VALUES (1, :current_time, :tick_count, :status, NOW())
-                    ON CONFLICT (id) DO UPDATE SET
-                        current_simulation_time = :current_time,
-                        tick_count = :tick_count,
-                        status = :status,
-                        last_updated = NOW()
-                """),
+            conn.execute(
+                _UPSERT_SYSTEM_STATE_SQL,
                 {
                     "current_time": current_time,
                     "tick_count": tick_count,
@@ -198,15 +250,8 @@ def load_system_state() -> dict[str, Any] | None:
             resume_from = state["current_simulation_time"]
     """
     try:
-        with get_session() as session:
-            result = session.execute(
-                text(f"""
-                    SELECT current_simulation_time, tick_count, status, last_updated
-                    FROM {TABLE_SYSTEM_STATE}
-                    WHERE id = 1
-                """)
-            )
-            row = result.fetchone()
+        with get_engine().connect() as conn:
+            row = conn.exec_driver_sql(_SELECT_SYSTEM_STATE_SQL).fetchone()
             if row:
                 _logger.info(f"Loaded system state: tick {row[1]}, status '{row[2]}'")
                 return {
@@ -223,3 +268,58 @@ def load_system_state() -> dict[str, Any] | None:
     except SQLAlchemyError as e:
         _logger.warning(f"Failed to load system state: {e}")
         return None
+
+
+class StateWriter:
+    """Persist system state on a background thread (write-behind).
+    
+    submit() never blocks on the database. States are coalesced: a newer
+    state replaces one that has not been written yet, so only the latest
+    snapshot is saved. Call close() to write any pending state and stop.
+    
+    Example:
+        writer = StateWriter()
+        writer.submit(current_time, tick_count, "running")
+        writer.close()
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pending: tuple[datetime, int, str] | None = None
+        self._closing = False
+        self._thread = threading.Thread(target=self._run, name="state-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def native_id(self) -> int:
+        """OS thread id of the background writer thread (started in __init__), e.g. for CPU pinning."""
+        return self._thread.native_id
+
+    def submit(self, current_time: datetime, tick_count: int, status: str = "running") -> None:
+        """Queue state for saving, replacing any state not yet written."""
+        with self._lock:
+            self._pending = (current_time, tick_count, status)
+        self._wakeup.set()
+
+    def close(self, timeout: float | None = None) -> None:
+        """Write any pending state and stop the background thread."""
+        with self._lock:
+            self._closing = True
+        self._wakeup.set()
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait()
+            with self._lock:
+                self._wakeup.clear()
+                pending, self._pending = self._pending, None
+                closing = self._closing
+            if pending is not None:
+                try:
+                    save_system_state(*pending)
+                except Exception as e:
+                    _logger.warning(f"Failed to save system state (tick {pending[1]}): {e}")
+            if closing:
+                return
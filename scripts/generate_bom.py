@@ -2,11 +2,17 @@
 from __future__ import annotations
 
 import argparse
-import json
+import functools
+import os
 from pathlib import Path
 from typing import Any
 
-BASE_DIR = Path(__file__).resolve().parent.parent
+try:
+    from .json_io import write_json, read_json
+except ImportError:
+    from json_io import write_json, read_json
+
+BASE_DIR = Path(os.path.abspath(__file__)).parent.parent
 DATA_DIR = BASE_DIR / "data"
 
 # Per-product BOM: list of (component_id, qty). P-008 (Flight Controller) in all.
@@ -27,7 +33,7 @@ PRODUCT_BOMS: dict[str, list[tuple[str, float]]] = {
 
 
 def load_parts_by_id(parts_path: Path) -> dict[str, dict[str, Any]]:
-    parts = json.loads(parts_path.read_text(encoding="utf-8"))
+    parts = read_json(parts_path)
     if not isinstance(parts, list):
         raise ValueError(f"Expected parts JSON array in {parts_path}")
     by_id: dict[str, dict[str, Any]] = {}
@@ -42,33 +48,28 @@ def load_parts_by_id(parts_path: Path) -> dict[str, dict[str, Any]]:
     return by_id
 
 
-def validate_component_ids(products_bom: dict[str, Any], parts_by_id: dict[str, dict[str, Any]]) -> None:
-    missing: set[str] = set()
-    for product_id, data in products_bom.items():
-        if not isinstance(data, dict):
-            continue
-        for item in data.get("bom", []):
-            if not isinstance(item, dict):
-                continue
-            for comp in item.get("components", []):
-                if isinstance(comp, dict):
-                    cid = comp.get("component_id")
-                    if isinstance(cid, str) and cid and cid not in parts_by_id:
-                        missing.add(cid)
+def validate_component_ids(
+    product_boms: dict[str, list[tuple[str, float]]], parts_by_id: dict[str, dict[str, Any]]
+) -> None:
+    missing = {cid for comp_list in product_boms.values() for cid, _ in comp_list} - parts_by_id.keys()
     if missing:
         raise ValueError(f"BOM references unknown part_ids: {sorted(missing)}")
 
 
+# Output shape of PRODUCT_BOMS, built once at import (treat as read-only)
+_PRODUCTS_OUT: dict[str, Any] = {
+    product_id: {"bom": [{"components": [{"component_id": cid, "qty": qty} for cid, qty in comp_list]}]}
+    for product_id, comp_list in PRODUCT_BOMS.items()
+}
+
+
 def build_multi_product_bom() -> dict[str, Any]:
     """Build { "products": { "D-101": { "bom": [ { "components": [ {"component_id", "qty"}, ... ] } ] }, ... } }."""
-    products: dict[str, Any] = {}
-    for product_id, comp_list in PRODUCT_BOMS.items():
-        components = [{"component_id": cid, "qty": qty} for cid, qty in comp_list]
-        products[product_id] = {"bom": [{"components": components}]}
-    return {"products": products}
+    return {"products": _PRODUCTS_OUT}
 
 
-def main() -> int:
+@functools.lru_cache(maxsize=1)
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Generate bom.json (10 products, 10 shared parts).")
     parser.add_argument(
         "--parts",
@@ -82,14 +83,22 @@ def main() -> int:
         default=DATA_DIR / "bom.json",
         help="Output JSON path (default: bom.json).",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write compact JSON (no indentation) instead of pretty-printed output.",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
 
     parts_by_id = load_parts_by_id(args.parts)
+    validate_component_ids(PRODUCT_BOMS, parts_by_id)
     bom = build_multi_product_bom()
-    validate_component_ids(bom["products"], parts_by_id)
 
-    args.out.parent.mkdir(parents=True, exist_ok=True)
-    args.out.write_text(json.dumps(bom, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    write_json(args.out, bom, compact=args.compact)
     print(f"Wrote BOM ({len(bom['products'])} products) to {args.out}")
     return 0
 
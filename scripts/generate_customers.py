@@ -2,10 +2,16 @@
 from __future__ import annotations
 
 import argparse
-import json
+import functools
+import os
 from pathlib import Path
 
-BASE_DIR = Path(__file__).resolve().parent.parent
+try:
+    from .json_io import write_json
+except ImportError:
+    from json_io import write_json
+
+BASE_DIR = Path(os.path.abspath(__file__)).parent.parent
 DATA_DIR = BASE_DIR / "data"
 
 # 15 customers across 4 segments. destination_facility_id must match a facility in facilities.json.
@@ -32,14 +38,19 @@ CUSTOMERS_CATALOG: list[dict] = [
 ]
 
 
-def main() -> int:
+@functools.lru_cache(maxsize=1)
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Generate customers.json (15 customers, 4 segments).")
     parser.add_argument("--out", type=Path, default=DATA_DIR / "customers.json", help="Output JSON path (default: customers.json).")
     parser.add_argument("--count", type=int, default=15, help="Ignored; always 15 (kept for CLI compatibility).")
     parser.add_argument("--seed", type=int, default=42, help="Ignored (kept for CLI compatibility).")
-    args = parser.parse_args()
-    args.out.parent.mkdir(parents=True, exist_ok=True)
-    args.out.write_text(json.dumps(CUSTOMERS_CATALOG, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    parser.add_argument("--compact", action="store_true", help="Write compact JSON (no indentation) instead of pretty-printed output.")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    write_json(args.out, CUSTOMERS_CATALOG, compact=args.compact)
     print(f"Wrote {len(CUSTOMERS_CATALOG)} customers to {args.out}")
     return 0
 
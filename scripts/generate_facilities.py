@@ -2,10 +2,17 @@
 from __future__ import annotations
 
 import argparse
-import json
+import functools
+import os
+import sys
 from pathlib import Path
 
-BASE_DIR = Path(__file__).resolve().parent.parent
+try:
+    from .json_io import dumps_json, precompute_json_bytes, write_json_bytes
+except ImportError:
+    from json_io import dumps_json, precompute_json_bytes, write_json_bytes
+
+BASE_DIR = Path(os.path.abspath(__file__)).parent.parent
 DATA_DIR = BASE_DIR / "data"
 
 # Plant: FAC-001 per plan. Delivery facilities for outbound routes (customers reference destination_facility_id).
@@ -26,13 +33,32 @@ FACILITIES = [
     {"facility_id": "dist_apac_01", "facility_name": "APAC DC Singapore", "city": "Singapore", "state": "", "country": "Singapore", "facility_type": "distribution", "region": "APAC", "location_code": "SGP_SIN"},
 ]
 
+_FACILITIES_BYTES = precompute_json_bytes(FACILITIES)
+
 
-def main() -> int:
+@functools.lru_cache(maxsize=1)
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Generate facilities.json (FAC-001 plant + DCs with location_code).")
     parser.add_argument("--out", type=Path, default=DATA_DIR / "facilities.json", help="Output path (default: data/facilities.json)")
-    args = parser.parse_args()
-    args.out.parent.mkdir(parents=True, exist_ok=True)
-    args.out.write_text(json.dumps(FACILITIES, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    parser.add_argument("--check", action="store_true", help="Verify the output file matches FACILITIES instead of writing it; exit 1 if it differs.")
+    parser.add_argument("--compact", action="store_true", help="Write compact JSON (no indentation) instead of pretty-printed output.")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    body = dumps_json(FACILITIES) if args.compact else _FACILITIES_BYTES
+    if args.check:
+        try:
+            current = args.out.read_bytes()
+        except OSError:
+            current = None
+        if current != body:
+            print(f"{args.out} does not match FACILITIES; rerun without --check", file=sys.stderr)
+            return 1
+        print(f"{args.out} matches {len(FACILITIES)} facilities")
+        return 0
+    write_json_bytes(args.out, body)
     print(f"Wrote {len(FACILITIES)} facilities to {args.out}")
     return 0
 
@@ -2,19 +2,25 @@
 from __future__ import annotations
 
 import argparse
-import json
+import functools
+import os
 import random
 from pathlib import Path
 from typing import Any
 
-BASE_DIR = Path(__file__).resolve().parent.parent
+try:
+    from .json_io import write_json, read_json
+except ImportError:
+    from json_io import write_json, read_json
+
+BASE_DIR = Path(os.path.abspath(__file__)).parent.parent
 DATA_DIR = BASE_DIR / "data"
 
 PRODUCT_IDS = ["D-101", "D-102", "D-103", "D-201", "D-202", "D-203", "D-204", "D-301", "D-302", "D-303"]
 
 
 def load_part_ids(parts_path: Path) -> list[str]:
-    parts = json.loads(parts_path.read_text(encoding="utf-8"))
+    parts = read_json(parts_path)
     if not isinstance(parts, list):
         raise ValueError(f"Expected parts JSON array in {parts_path}")
     part_ids = [p.get("part_id") for p in parts if isinstance(p, dict) and p.get("part_id")]
@@ -26,13 +32,14 @@ def load_part_ids(parts_path: Path) -> list[str]:
 def load_product_ids(products_path: Path | None) -> list[str]:
     if products_path is None or not products_path.exists():
         return PRODUCT_IDS
-    data = json.loads(products_path.read_text(encoding="utf-8"))
+    data = read_json(products_path)
     if not isinstance(data, list):
         return PRODUCT_IDS
     ids = [p.get("product_id") for p in data if isinstance(p, dict) and p.get("product_id")]
     return ids if ids else PRODUCT_IDS
 
 
+@functools.lru_cache(maxsize=1024)
 def inventory_levels_for_part(qty_on_hand: int) -> tuple[int, int]:
     safety_stock = max(20, int(round(qty_on_hand * 0.10)))
     reorder_point = max(safety_stock + 10, int(round(qty_on_hand * 0.25)))
@@ -75,7 +82,8 @@ def generate_inventory(
     return inventory
 
 
-def main() -> int:
+@functools.lru_cache(maxsize=1)
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Generate inventory.json (10 parts + 10 products).")
     parser.add_argument("--parts", type=Path, default=DATA_DIR / "parts.json", help="Path to parts JSON.")
     parser.add_argument("--products", type=Path, default=DATA_DIR / "products.json", help="Path to products JSON (optional).")
@@ -86,7 +94,12 @@ def main() -> int:
     parser.add_argument("--finished-product-qty", type=int, default=None, help="Starting on-hand per finished product (default: mean_daily_demand * days_of_stock).")
     parser.add_argument("--mean-daily-demand", type=int, default=2, help="Mean daily demand per product for pre-seed (default 2).")
     parser.add_argument("--days-of-stock", type=int, default=7, help="Days of stock for pre-seed (default 7).")
-    args = parser.parse_args()
+    parser.add_argument("--compact", action="store_true", help="Write compact JSON (no indentation) instead of pretty-printed output.")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
 
     inventory = generate_inventory(
         parts_path=args.parts,
@@ -98,8 +111,7 @@ def main() -> int:
         mean_daily_demand=args.mean_daily_demand,
         days_of_stock=args.days_of_stock,
     )
-    args.out.parent.mkdir(parents=True, exist_ok=True)
-    args.out.write_text(json.dumps(inventory, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    write_json(args.out, inventory, compact=args.compact)
     print(f"Wrote inventory for {len(inventory)} items to {args.out}")
     return 0
 
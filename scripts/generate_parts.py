@@ -2,10 +2,16 @@
 from __future__ import annotations
 
 import argparse
-import json
+import functools
+import os
 from pathlib import Path
 
-BASE_DIR = Path(__file__).resolve().parent.parent
+try:
+    from .json_io import write_json
+except ImportError:
+    from json_io import write_json
+
+BASE_DIR = Path(os.path.abspath(__file__)).parent.parent
 DATA_DIR = BASE_DIR / "data"
 
 # Fixed catalog: 10 parts per plan. valid_supplier_ids match generate_suppliers output (SUP-001..SUP-004).
@@ -28,15 +34,20 @@ def generate_parts() -> list[dict]:
     return list(PARTS_CATALOG)
 
 
-def main() -> int:
+@functools.lru_cache(maxsize=1)
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Generate parts.json (10 fixed shared components P-001..P-010).")
     parser.add_argument("--out", type=Path, default=DATA_DIR / "parts.json", help="Output path.")
     parser.add_argument("--seed", type=int, default=None, help="Ignored; kept for CLI compatibility.")
-    args = parser.parse_args()
+    parser.add_argument("--compact", action="store_true", help="Write compact JSON (no indentation) instead of pretty-printed output.")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
 
     parts = generate_parts()
-    args.out.parent.mkdir(parents=True, exist_ok=True)
-    args.out.write_text(json.dumps(parts, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    write_json(args.out, parts, compact=args.compact)
     print(f"Wrote {len(parts)} parts to {args.out}")
     return 0
 
@@ -2,22 +2,33 @@
 from __future__ import annotations
 
 import argparse
-import json
+import functools
+import os
 from pathlib import Path
 
-BASE_DIR = Path(__file__).resolve().parent.parent
+try:
+    from .json_io import write_json
+except ImportError:
+    from json_io import write_json
+
+BASE_DIR = Path(os.path.abspath(__file__)).parent.parent
 DATA_DIR = BASE_DIR / "data"
 
 
-def main() -> int:
+@functools.lru_cache(maxsize=1)
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Generate production_schedule.json (empty active_jobs for 10-drone scenario).")
     parser.add_argument("--out", type=Path, default=DATA_DIR / "production_schedule.json", help="Output path.")
     parser.add_argument("--wip-jobs", type=int, default=0, help="Number of initial WIP jobs (default 0).")
     parser.add_argument("--seed", type=int, default=42, help="Ignored; kept for CLI compatibility.")
-    args = parser.parse_args()
+    parser.add_argument("--compact", action="store_true", help="Write compact JSON (no indentation) instead of pretty-printed output.")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
     schedule = {"active_jobs": []}
-    args.out.parent.mkdir(parents=True, exist_ok=True)
-    args.out.write_text(json.dumps(schedule, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    write_json(args.out, schedule, compact=args.compact)
     print(f"Wrote production_schedule to {args.out}")
     return 0
 
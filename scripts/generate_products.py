@@ -2,10 +2,16 @@
 from __future__ import annotations
 
 import argparse
-import json
+import functools
+import os
 from pathlib import Path
 
-BASE_DIR = Path(__file__).resolve().parent.parent
+try:
+    from .json_io import dumps_json, precompute_json_bytes, write_json_bytes
+except ImportError:
+    from json_io import dumps_json, precompute_json_bytes, write_json_bytes
+
+BASE_DIR = Path(os.path.abspath(__file__)).parent.parent
 DATA_DIR = BASE_DIR / "data"
 
 PRODUCTS_CATALOG: list[dict] = [
@@ -22,19 +28,27 @@ PRODUCTS_CATALOG: list[dict] = [
 ]
 
 
+_PRODUCTS_BYTES = precompute_json_bytes(PRODUCTS_CATALOG)
+
+
 def generate_products() -> list[dict]:
     """Return the 10 drone products. Single source of truth for product_id, name, type, key_features."""
     return list(PRODUCTS_CATALOG)
 
 
-def main() -> int:
+@functools.lru_cache(maxsize=1)
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Generate products.json (10 drone models D-101..D-303).")
     parser.add_argument("--out", type=Path, default=DATA_DIR / "products.json", help="Output path.")
     parser.add_argument("--seed", type=int, default=None, help="Ignored; kept for CLI compatibility.")
-    args = parser.parse_args()
+    parser.add_argument("--compact", action="store_true", help="Write compact JSON (no indentation) instead of pretty-printed output.")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
     products = generate_products()
-    args.out.parent.mkdir(parents=True, exist_ok=True)
-    args.out.write_text(json.dumps(products, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    write_json_bytes(args.out, dumps_json(products) if args.compact else _PRODUCTS_BYTES)
     print(f"Wrote {len(products)} products to {args.out}")
     return 0
 
@@ -2,15 +2,25 @@
 from __future__ import annotations
 
 import argparse
-import json
+import functools
+import os
 from pathlib import Path
 
-BASE_DIR = Path(__file__).resolve().parent.parent
+try:
+    from .json_io import write_json
+except ImportError:
+    from json_io import write_json
+
+BASE_DIR = Path(os.path.abspath(__file__)).parent.parent
 DATA_DIR = BASE_DIR / "data"
 
 PLANT_FACILITY_ID = "FAC-001"
 PLANT_LOCATION_CODE = "USA_CHI"
 
+# route_id prefixes; the destination code or country slug is appended
+OUTBOUND_ROUTE_PREFIX = f"out_{PLANT_LOCATION_CODE}_"
+INBOUND_ROUTE_PREFIX = f"in_{PLANT_LOCATION_CODE}_"
+
 # Outbound: plant (USA_CHI) to each delivery facility. CODE -> CODE.
 OUTBOUND_ROUTES = [
     {"destination_facility_id": "dist_na_01", "destination_location_code": "USA_DET", "typical_distance_miles": 283, "typical_transit_days": 2, "base_rate_per_mile": 0.12},
@@ -27,15 +37,21 @@ INBOUND_ROUTES = [
 ]
 
 
-def main() -> int:
+@functools.lru_cache(maxsize=1)
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Generate routes.json (CODE -> CODE).")
     parser.add_argument("--out", type=Path, default=DATA_DIR / "routes.json", help="Output path (default: data/routes.json)")
-    args = parser.parse_args()
+    parser.add_argument("--compact", action="store_true", help="Write compact JSON (no indentation) instead of pretty-printed output.")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
 
     outbound = []
     for r in OUTBOUND_ROUTES:
         dest_code = r["destination_location_code"]
-        route_id = f"out_{PLANT_LOCATION_CODE}_{dest_code}"
+        route_id = OUTBOUND_ROUTE_PREFIX + dest_code
         outbound.append({
             "route_id": route_id,
             "origin_facility_id": PLANT_FACILITY_ID,
@@ -50,7 +66,7 @@ def main() -> int:
     inbound = []
     for r in INBOUND_ROUTES:
         country = r["destination_country"]
-        route_id = f"in_{PLANT_LOCATION_CODE}_{country.lower().replace(' ', '_')}"
+        route_id = INBOUND_ROUTE_PREFIX + country.lower().replace(" ", "_")
         inbound.append({
             "route_id": route_id,
             "origin_facility_id": PLANT_FACILITY_ID,
@@ -62,8 +78,7 @@ def main() -> int:
         })
 
     data = {"inbound": inbound, "outbound": outbound}
-    args.out.parent.mkdir(parents=True, exist_ok=True)
-    args.out.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    write_json(args.out, data, compact=args.compact)
     print(f"Wrote {len(outbound)} outbound and {len(inbound)} inbound routes to {args.out}")
     return 0
 
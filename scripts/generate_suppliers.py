@@ -2,10 +2,16 @@
 from __future__ import annotations
 
 import argparse
-import json
+import functools
+import os
 from pathlib import Path
 
-BASE_DIR = Path(__file__).resolve().parent.parent
+try:
+    from .json_io import dumps_json, precompute_json_bytes, write_json_bytes
+except ImportError:
+    from json_io import dumps_json, precompute_json_bytes, write_json_bytes
+
+BASE_DIR = Path(os.path.abspath(__file__)).parent.parent
 DATA_DIR = BASE_DIR / "data"
 
 # Fixed 4 suppliers per plan. country used for inbound route lookup (destination_country).
@@ -17,14 +23,22 @@ SUPPLIERS_CATALOG: list[dict] = [
 ]
 
 
-def main() -> int:
+_SUPPLIERS_BYTES = precompute_json_bytes(SUPPLIERS_CATALOG)
+
+
+@functools.lru_cache(maxsize=1)
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Generate suppliers.json (4 fixed suppliers).")
     parser.add_argument("--out", type=Path, default=DATA_DIR / "suppliers.json", help="Output path.")
     parser.add_argument("--seed", type=int, default=None, help="Ignored; kept for CLI compatibility.")
     parser.add_argument("--count", type=int, default=4, help="Ignored; always 4.")
-    args = parser.parse_args()
-    args.out.parent.mkdir(parents=True, exist_ok=True)
-    args.out.write_text(json.dumps(SUPPLIERS_CATALOG, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    parser.add_argument("--compact", action="store_true", help="Write compact JSON (no indentation) instead of pretty-printed output.")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    write_json_bytes(args.out, dumps_json(SUPPLIERS_CATALOG) if args.compact else _SUPPLIERS_BYTES)
     print(f"Wrote {len(SUPPLIERS_CATALOG)} suppliers to {args.out}")
     return 0
 
@@ -0,0 +1,55 @@
+"""JSON file helpers shared by the generators and the simulation engine.
+
+orjson is used when installed; otherwise the stdlib json module produces
+the same bytes (UTF-8, unescaped, compact separators or 2-space indent,
+trailing newline).
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps_json(obj: Any, *, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes with a trailing newline (2-space indent if indent)."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return (json.dumps(obj, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+    return (json.dumps(obj, separators=(",", ":"), ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def read_json(path: Path) -> Any:
+    """Parse a JSON file with orjson when available, otherwise stdlib json."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def precompute_json_bytes(obj: Any) -> bytes:
+    """Serialize a constant catalog once, at import, in the default (indented) layout.
+
+    Write the result with write_json_bytes so repeated runs in one process
+    write the file without serializing it again.
+    """
+    return dumps_json(obj, indent=True)
+
+
+def write_json(path: Path, obj: Any, compact: bool = False) -> None:
+    """Write obj to path as indented JSON, or unindented when compact."""
+    write_json_bytes(path, dumps_json(obj, indent=not compact))
+
+
+def write_json_bytes(path: Path, data: bytes) -> None:
+    """Write already-serialized JSON bytes to path, creating parent directories."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
@@ -43,20 +43,28 @@ Author: SkyForge Dynamics Data Engineering Team
 from __future__ import annotations
 
 import atexit
+import functools
 import io
 import json
 import os
 import random
-import uuid
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
+try:
+    from .json_io import dumps_json, read_json
+except ImportError:
+    from json_io import dumps_json, read_json
 
-BASE_DIR = Path(__file__).resolve().parent.parent
+
+BASE_DIR = Path(os.path.abspath(__file__)).parent.parent
 DATA_DIR = BASE_DIR / "data"
 
+# Write buffer for the single-file (historical) events log
+EVENTS_SINGLE_FILE_BUFFER_SIZE = 1 << 20
+
 # Default simulation parameters (can be overridden via config)
 DEFAULT_CONFIG = {
     # Demand settings
@@ -209,12 +217,45 @@ def iso_utc(dt: datetime) -> str:
     return dt.astimezone(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
 
 
+# Random UUIDs minted per os.urandom call by new_uuid4
+UUID4_BATCH_SIZE = 256
+
+_uuid4_pool: list[str] = []
+
+
+def _refill_uuid4_pool() -> None:
+    raw = bytearray(os.urandom(16 * UUID4_BATCH_SIZE))
+    # Set the version (4) and RFC 4122 variant bits, as uuid.uuid4() does
+    raw[6::16] = bytes((b & 0x0F) | 0x40 for b in raw[6::16])
+    raw[8::16] = bytes((b & 0x3F) | 0x80 for b in raw[8::16])
+    h = raw.hex()
+    _uuid4_pool.extend(
+        f"{h[i:i + 8]}-{h[i + 8:i + 12]}-{h[i + 12:i + 16]}-{h[i + 16:i + 20]}-{h[i + 20:i + 32]}"
+        for i in range(0, len(h), 32)
+    )
+
+
+def new_uuid4() -> str:
+    """Return a random UUID string, equivalent to str(uuid.uuid4()) but drawn from a batch."""
+    try:
+        return _uuid4_pool.pop()
+    except IndexError:
+        _refill_uuid4_pool()
+        return _uuid4_pool.pop()
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_iso_utc(value: str) -> datetime:
+    """Parse an ISO 8601 string as written by iso_utc (memoized; job timestamps repeat every tick)."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
 def load_json(path: Path) -> Any:
     """Load JSON file with error handling."""
     if not path.exists():
         raise DataLoadError(f"Required data file not found: {path}")
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
+        return read_json(path)
     except json.JSONDecodeError as e:
         raise DataLoadError(f"Invalid JSON in {path}: {e}") from e
 
@@ -224,7 +265,7 @@ def load_json_or_default(path: Path, default: Any) -> Any:
     if not path.exists():
         return default
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
+        return read_json(path)
     except json.JSONDecodeError:
         return default
 
@@ -303,6 +344,13 @@ class PendingDelivery:
     actual_delivery: datetime  # When delivery actually occurs (may be late)
     origin_facility_id: str
     destination_facility_id: str
+    # iso_utc forms of the (immutable) scheduled times for Pickup/Delivery events, formatted once at creation
+    scheduled_pickup_iso: str = field(init=False, repr=False)
+    scheduled_delivery_iso: str = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.scheduled_pickup_iso = iso_utc(self.scheduled_pickup)
+        self.scheduled_delivery_iso = iso_utc(self.scheduled_delivery)
 
 
 @dataclass
@@ -405,7 +453,10 @@ class WorldEngine:
         events_dir_raw = self.config.get("events_dir") or os.environ.get("EVENTS_DIR", "data/events")
         self.events_dir = Path(events_dir_raw) if Path(events_dir_raw).is_absolute() else BASE_DIR / events_dir_raw
         self._events_current_day: date | None = None
-        self._events_file: io.TextIOWrapper | None = None
+        self._events_file: io.BufferedWriter | None = None
+        # iso_utc(current_time), reformatted only when current_time is replaced (once per tick)
+        self._now_iso_for: datetime | None = None
+        self._now_iso_value = ""
 
         # Master data (loaded once)
         self.suppliers = load_json(self.data_dir / "suppliers.json")
@@ -447,6 +498,8 @@ class WorldEngine:
 
         # Dynamic state
         self.inventory = load_json(self.data_dir / "inventory.json")
+        # Bumped whenever a qty_on_hand changes, so readers can cache derived views
+        self.inventory_version = 0
         self.production_schedule = load_json_or_default(
             self.data_dir / "production_schedule.json",
             {"active_jobs": []},
@@ -546,10 +599,18 @@ class WorldEngine:
         if not isinstance(self.inventory, dict):
             self.inventory = {}
 
+    def _now_iso(self) -> str:
+        """Return iso_utc(self.current_time), shared by every event in the same tick."""
+        now = self.current_time
+        if now is not self._now_iso_for:
+            self._now_iso_value = iso_utc(now)
+            self._now_iso_for = now
+        return self._now_iso_value
+
     def _log_event(self, event_type: str, payload: dict[str, Any]) -> None:
         """Log an event to date-partitioned JSONL (data/events/YYYY-MM-DD.jsonl)."""
         event = {
-            "timestamp": iso_utc(self.current_time),
+            "timestamp": self._now_iso(),
             "event_type": event_type,
             "payload": payload,
         }
@@ -557,15 +618,16 @@ class WorldEngine:
 
     def _log_event_to_json(self, event: dict[str, Any]) -> None:
         """Append an event to JSONL: single file (historical) or date-partitioned (run-service/simulate)."""
-        json_line = json.dumps(event, ensure_ascii=False)
+        json_line = dumps_json(event)
         try:
             if self._events_single_file and self._events_single_file_path is not None:
-                self._events_single_file_path.parent.mkdir(parents=True, exist_ok=True)
                 if self._events_file is None:
-                    self._events_file = self._events_single_file_path.open("a", encoding="utf-8")
-                self._events_file.write(json_line + "\n")
+                    self._events_single_file_path.parent.mkdir(parents=True, exist_ok=True)
+                    self._events_file = self._events_single_file_path.open(
+                        "ab", buffering=EVENTS_SINGLE_FILE_BUFFER_SIZE
+                    )
+                self._events_file.write(json_line)
             else:
-                self.events_dir.mkdir(parents=True, exist_ok=True)
                 day = self.current_time.date()
                 if self._events_current_day != day:
                     if self._events_file is not None:
@@ -573,13 +635,26 @@ class WorldEngine:
                         self._events_file.close()
                         self._events_file = None
                     self._events_current_day = day
+                    self.events_dir.mkdir(parents=True, exist_ok=True)
                     path = self.events_dir / f"{day:%Y-%m-%d}.jsonl"
-                    self._events_file = path.open("a", encoding="utf-8")
-                self._events_file.write(json_line + "\n")
+                    self._events_file = path.open("ab")
+                self._events_file.write(json_line)
         except IOError as e:
             import sys
             print(f"Warning: Failed to write event log: {e}", file=sys.stderr)
 
+    def flush_events(self, fsync: bool = False) -> None:
+        """Flush buffered events to the OS; with fsync=True also force them to disk."""
+        if self._events_file is None:
+            return
+        try:
+            self._events_file.flush()
+            if fsync:
+                os.fsync(self._events_file.fileno())
+        except OSError as e:
+            import sys
+            print(f"Warning: Failed to flush event log: {e}", file=sys.stderr)
+
     def tick(self) -> None:
         """
         Advance simulation by one hour.
@@ -612,6 +687,12 @@ class WorldEngine:
         self.generate_demand()
         self.run_production()
 
+    def tick_many(self, n: int) -> None:
+        """Advance simulation by n hourly ticks (see tick)."""
+        tick = self.tick
+        for _ in range(n):
+            tick()
+
     def _is_business_hours(self) -> bool:
         """Check if current simulation time is within business hours."""
         hour = self.current_time.hour
@@ -921,6 +1002,7 @@ class WorldEngine:
             # Fulfill as much as we can
             qty_to_ship = min(stock, backorder.qty_remaining)
             self.inventory[backorder.product_id]["qty_on_hand"] = stock - qty_to_ship
+            self.inventory_version += 1
             backorder.qty_remaining -= qty_to_ship
             
             job_id = self._allocated_job_for_fulfillment(backorder.product_id, qty_to_ship)
@@ -976,7 +1058,7 @@ class WorldEngine:
         mult_min = self.config.get("promo_demand_multiplier_min", 1.2)
         mult_max = self.config.get("promo_demand_multiplier_max", 1.8)
         multiplier = self.rng.uniform(mult_min, mult_max)
-        promo_id = str(uuid.uuid4())
+        promo_id = new_uuid4()
         self._active_promos.append({
             "promo_id": promo_id,
             "end_time": end_time,
@@ -986,7 +1068,7 @@ class WorldEngine:
             "PromoActive",
             {
                 "promo_id": promo_id,
-                "start_time": iso_utc(self.current_time),
+                "start_time": self._now_iso(),
                 "end_time": iso_utc(end_time),
                 "demand_multiplier": round(multiplier, 2),
             },
@@ -1059,11 +1141,11 @@ class WorldEngine:
 
         product_id = self.rng.choice(self.product_ids)
         order = SalesOrder(
-            order_id=str(uuid.uuid4()),
+            order_id=new_uuid4(),
             customer_id=customer["customer_id"],
             product_id=product_id,
             qty=qty,
-            created_at=iso_utc(self.current_time),
+            created_at=self._now_iso(),
         )
         unit_price = self.config.get("default_unit_price", 1250.0)
         line_total = round(unit_price * order.qty, 2)
@@ -1097,6 +1179,7 @@ class WorldEngine:
         if stock >= order.qty:
             # Full fulfillment
             self.inventory[order.product_id]["qty_on_hand"] = stock - order.qty
+            self.inventory_version += 1
             job_id = self._allocated_job_for_fulfillment(order.product_id, order.qty)
             unit_price = self.config.get("default_unit_price", 1250.0)
             amount = round(unit_price * order.qty, 2)
@@ -1135,6 +1218,7 @@ class WorldEngine:
             qty_backordered = order.qty - stock
             
             self.inventory[order.product_id]["qty_on_hand"] = 0
+            self.inventory_version += 1
             
             job_id = self._allocated_job_for_fulfillment(order.product_id, qty_shipped)
             unit_price = self.config.get("default_unit_price", 1250.0)
@@ -1284,7 +1368,7 @@ class WorldEngine:
         if not route:
             return
         oids = order_ids if order_ids is not None else [order_id]
-        load_id = str(uuid.uuid4())
+        load_id = new_uuid4()
         route_id = route.get("route_id", load_id)
         typical_transit_days = route.get("typical_transit_days", 3)
         scheduled_pickup = self.current_time
@@ -1317,7 +1401,7 @@ class WorldEngine:
                 "scheduled_pickup": iso_utc(scheduled_pickup),
                 "scheduled_delivery": iso_utc(scheduled_delivery),
                 "actual_delivery": iso_utc(actual_delivery),
-                "created_at": iso_utc(self.current_time),
+                "created_at": self._now_iso(),
                 "distance_miles": distance_miles,
             },
         )
@@ -1393,12 +1477,12 @@ class WorldEngine:
             self._log_event(
                 "DeliveryEvent",
                 {
-                    "event_id": str(uuid.uuid4()),
+                    "event_id": new_uuid4(),
                     "load_id": pd.load_id,
                     "event_type": "Pickup",
                     "facility_id": pd.origin_facility_id,
-                    "scheduled_datetime": iso_utc(pd.scheduled_pickup),
-                    "actual_datetime": iso_utc(pd.scheduled_pickup),
+                    "scheduled_datetime": pd.scheduled_pickup_iso,
+                    "actual_datetime": pd.scheduled_pickup_iso,
                     "detention_minutes": 0,
                     "on_time_flag": True,
                 },
@@ -1406,11 +1490,11 @@ class WorldEngine:
             self._log_event(
                 "DeliveryEvent",
                 {
-                    "event_id": str(uuid.uuid4()),
+                    "event_id": new_uuid4(),
                     "load_id": pd.load_id,
                     "event_type": "Delivery",
                     "facility_id": pd.destination_facility_id,
-                    "scheduled_datetime": iso_utc(pd.scheduled_delivery),
+                    "scheduled_datetime": pd.scheduled_delivery_iso,
                     "actual_datetime": iso_utc(actual_datetime),
                     "detention_minutes": 0,
                     "on_time_flag": on_time,
@@ -1505,7 +1589,7 @@ class WorldEngine:
         days_max = self.config.get("invoice_payment_days_max", 30)
         payment_days = self.rng.randint(days_min, days_max)
         due_date = self.current_time + timedelta(days=payment_days)
-        invoice_id = str(uuid.uuid4())
+        invoice_id = new_uuid4()
         self._log_event(
             "InvoiceCreated",
             {
@@ -1517,7 +1601,7 @@ class WorldEngine:
                 "amount": amount,
                 "currency": currency,
                 "due_date": iso_utc(due_date),
-                "timestamp": iso_utc(self.current_time),
+                "timestamp": self._now_iso(),
             },
         )
         self._pending_invoices.append(
@@ -1683,10 +1767,10 @@ class WorldEngine:
         )
         
         job = {
-            "job_id": str(uuid.uuid4()),
+            "job_id": new_uuid4(),
             "product_id": product_id,
             "status": "Planned",
-            "created_at": iso_utc(self.current_time),
+            "created_at": self._now_iso(),
             "start_date": None,  # Set when production actually starts
             "due_date": iso_utc(self.current_time + timedelta(days=3)),
             "expected_completion": None,  # Set when production starts
@@ -1909,6 +1993,7 @@ class WorldEngine:
         self.inventory[po.part_id]["qty_on_hand"] = (
             self.inventory[po.part_id].get("qty_on_hand", 0) + int(received_qty)
         )
+        self.inventory_version += 1
         
         # Log receipt event (with projected vs actual for lead time analytics)
         actual_receipt_time = po.actual_arrival if po.actual_arrival is not None else self.current_time
@@ -1952,7 +2037,7 @@ class WorldEngine:
                 if not missing:
                     self._consume_parts_for_job(product_id, batch_size)
                     job["status"] = "WIP"
-                    job["start_date"] = iso_utc(self.current_time)
+                    job["start_date"] = self._now_iso()
                     
                     # Calculate expected completion
                     duration = job.get("production_duration_hours", 
@@ -1983,7 +2068,7 @@ class WorldEngine:
                 expected_str = job.get("expected_completion")
                 if expected_str:
                     # Parse the expected completion time
-                    expected = datetime.fromisoformat(expected_str.replace("Z", "+00:00"))
+                    expected = parse_iso_utc(expected_str)
                     if self.current_time >= expected:
                         # Production complete - add finished goods to inventory
                         self._complete_production_job(job)
@@ -2006,9 +2091,10 @@ class WorldEngine:
         self.inventory[product_id]["qty_on_hand"] = (
             self.inventory[product_id].get("qty_on_hand", 0) + qty_per_job
         )
+        self.inventory_version += 1
         
         job["status"] = "Completed"
-        job["actual_completion"] = iso_utc(self.current_time)
+        job["actual_completion"] = self._now_iso()
         
         self._log_event(
             "ProductionCompleted",
@@ -2055,6 +2141,7 @@ class WorldEngine:
             if not entry:
                 continue
             entry["qty_on_hand"] = max(0, entry.get("qty_on_hand", 0) - qty)
+            self.inventory_version += 1
 
     def order_parts_from_supplier(self, *, part_id: str, qty: float, is_reorder: bool = False) -> None:
         """
@@ -2112,7 +2199,7 @@ class WorldEngine:
         unit_cost, base_cost, cost_variance_pct = self._get_current_part_cost(part_id, supplier_id)
         total_cost = round(unit_cost * qty, 2)
 
-        po_id = str(uuid.uuid4())
+        po_id = new_uuid4()
 
         # Track the pending PO for later receipt
         pending_po = PendingPurchaseOrder(
@@ -2157,19 +2244,16 @@ class WorldEngine:
         if self._events_file is not None:
             try:
                 self._events_file.flush()
+                os.fsync(self._events_file.fileno())
                 self._events_file.close()
             except IOError:
                 pass
             self._events_file = None
             self._events_current_day = None
         try:
-            (self.data_dir / "inventory.json").write_text(
-                json.dumps(self.inventory, indent=2, ensure_ascii=False) + "\n",
-                encoding="utf-8",
-            )
-            (self.data_dir / "production_schedule.json").write_text(
-                json.dumps(self.production_schedule, indent=2, ensure_ascii=False) + "\n",
-                encoding="utf-8",
+            (self.data_dir / "inventory.json").write_bytes(dumps_json(self.inventory, indent=True))
+            (self.data_dir / "production_schedule.json").write_bytes(
+                dumps_json(self.production_schedule, indent=True)
             )
         except IOError as e:
             import sys